@@ -1,14 +1,23 @@
 import asyncio
+import atexit
+import heapq
 import logging
 import os
-from typing import List, Set, Dict, Any
+import queue
+import random
+import time
+from functools import lru_cache
+from operator import itemgetter
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 from datetime import datetime
-import json
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from email.utils import parsedate_to_datetime
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, BackgroundTasks
+import orjson
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 # Load environment variables
@@ -19,30 +28,88 @@ except ImportError:
     # dotenv not available, continue without it
     pass
 
-# Import tracking functions
-try:
-    from tracking import get_new_items, get_initial_items, cleanup_persistent_browser
-except ImportError as e:
-    print(f"Error importing from tracking.py: {e}")
-    exit(1)
+# Tracking functions are imported on first use: importing tracking initializes the database
+# and pulls in SeleniumBase, which slows down startup and every --reload cycle
+@lru_cache(maxsize=None)
+def get_tracking():
+    """Import and return the tracking module."""
+    import tracking
+    return tracking
+
+# Listener thread that performs the actual log I/O (see configure_logging)
+log_listener: Optional[QueueListener] = None
+
+def configure_logging(*handlers: logging.Handler) -> QueueListener:
+    """
+    Route log records through a queue so formatting and handler I/O run on a listener
+    thread instead of blocking the event loop. Defaults to a single console handler.
+    """
+    global log_listener
+    
+    stop_logging()
+    if not handlers:
+        handlers = (logging.StreamHandler(),)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Only merge args into the message here; the listener's handlers apply the real format
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler], force=True)
+    log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    log_listener.start()
+    return log_listener
+
+def stop_logging():
+    """Flush queued records and stop the listener thread, if running."""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_logging()
+atexit.register(stop_logging)
+logger = logging.getLogger(__name__)
 
-# Global state for WebSocket connections and polling
-connected_clients: List[WebSocket] = []
+# Global polling state (connections are tracked by the ConnectionManager)
 polling_active: bool = False
 polling_url: str = os.getenv("URL")
 polling_task: asyncio.Task = None
 
+# Serialized items of the WebSocket initial_data message plus their count.
+# Rebuilt lazily on the next connect after the poller finds new items.
+initial_items_cache: Optional[Tuple[orjson.Fragment, int]] = None
+
+# Latest items (newest first) served by /items and WebSocket connects. Read from tracking once,
+# then kept current by merging in what the poller finds, so serving them needs no I/O.
+LATEST_ITEMS_LIMIT = 100
+latest_items: Optional[List[Dict]] = None
+latest_items_lock: Optional[asyncio.Lock] = None  # created on first use, inside the running loop
+
+# Single worker thread for blocking tracking calls. One worker bounds the thread use and keeps
+# those calls serialized, since tracking's module-level state is not thread-safe.
+tracking_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tracking")
+
+# Maximum number of serialized broadcasts waiting for the broadcaster task
+BROADCAST_QUEUE_SIZE = 64
+
+# Polling cadence (seconds). Quiet or failing polls back off exponentially up to the maximum;
+# server pacing hints (Retry-After / max-age) are capped at the maximum as well.
+POLL_INTERVAL = 5
+MAX_POLL_INTERVAL = 300
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    logging.info("FastAPI server starting up")
+    logger.info("FastAPI server starting up")
+    manager.start_broadcaster()
     yield
     # Shutdown
     global polling_active, polling_task
-    logging.info("FastAPI server shutting down")
+    logger.info("FastAPI server shutting down")
     
     # Stop polling
     polling_active = False
@@ -53,25 +120,37 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
     
+    # Stop fanning out queued broadcasts
+    await manager.stop_broadcaster()
+    
     # Close all WebSocket connections
     if 'manager' in globals():
         for connection in manager.active_connections.copy():
             try:
                 await connection.close()
             except Exception as e:
-                logging.error(f"Error closing WebSocket connection: {e}")
+                logger.error("Error closing WebSocket connection: %s", e)
     
-    # Cleanup persistent browser
-    try:
-        cleanup_persistent_browser()
-        logging.info("✓ Persistent browser cleaned up")
-    except Exception as e:
-        logging.error(f"Error cleaning up persistent browser: {e}")
+    # Cleanup persistent browser (only if tracking was ever loaded). Runs on the tracking
+    # worker so it waits for a fetch that is still in flight instead of racing it.
+    if get_tracking.cache_info().currsize:
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                tracking_executor, get_tracking().cleanup_persistent_browser
+            )
+            logger.info("✓ Persistent browser cleaned up")
+        except Exception as e:
+            logger.error("Error cleaning up persistent browser: %s", e)
     
-    logging.info("Server shutdown complete")
+    logger.info("Server shutdown complete")
 
 # Initialize FastAPI app with lifespan
-app = FastAPI(title="NSE Announcements Tracker API", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="NSE Announcements Tracker API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # Configure CORS to allow connections from any URL
 app.add_middleware(
@@ -82,166 +161,230 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Pydantic models for API responses
-class Item(BaseModel):
-    timestamp: str
-    title: str
-    description: str
-    link: str
-    identifier: str
-
-class ItemsResponse(BaseModel):
-    items: List[Item]
-    count: int
-
-class StatusResponse(BaseModel):
-    polling_active: bool
-    connected_clients: int
-    url: str
-
+# Pydantic model for request validation. Responses are plain dicts serialized by orjson.
 class StartPollingRequest(BaseModel):
     url: str = os.getenv("URL")
 
+# Last formatted timestamp, reused for every message sent within the same second
+_timestamp_cache: Tuple[int, str] = (0, "")
+
+def current_timestamp() -> str:
+    """Return the current local time in ISO format (second precision), formatting at most once per second."""
+    global _timestamp_cache
+    
+    second = int(time.time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _timestamp_cache[1]
+
 # WebSocket manager class
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # A set keeps connect/disconnect O(1) during reconnect storms
+        self.active_connections: Set[WebSocket] = set()
+        # Serialized broadcasts are queued here and sent by a single broadcaster task,
+        # so producers (the poller, polling start/stop) never wait on slow sockets
+        self.outbox: Optional[asyncio.Queue] = None
+        self.broadcaster_task: Optional[asyncio.Task] = None
+
+    def start_broadcaster(self):
+        """Create the outbox queue and start the task that drains it."""
+        self.outbox = asyncio.Queue(maxsize=BROADCAST_QUEUE_SIZE)
+        self.broadcaster_task = asyncio.create_task(self._run_broadcaster())
+
+    async def stop_broadcaster(self):
+        """Cancel the broadcaster task; anything still queued is dropped."""
+        if self.broadcaster_task and not self.broadcaster_task.done():
+            self.broadcaster_task.cancel()
+            try:
+                await self.broadcaster_task
+            except asyncio.CancelledError:
+                pass
+        self.broadcaster_task = None
+        self.outbox = None
+
+    async def _run_broadcaster(self):
+        while True:
+            message = await self.outbox.get()
+            await self.broadcast(message)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logging.info(f"New WebSocket connection established. Total connections: {len(self.active_connections)}")
+        self.active_connections.add(websocket)
+        logger.info("New WebSocket connection established. Total connections: %d", len(self.active_connections))
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logging.info(f"WebSocket connection closed. Total connections: {len(self.active_connections)}")
+            self.active_connections.discard(websocket)
+            logger.info("WebSocket connection closed. Total connections: %d", len(self.active_connections))
 
-    async def send_personal_message(self, message: str, websocket: WebSocket):
+    async def send_personal_message(self, message: bytes, websocket: WebSocket):
         try:
-            await websocket.send_text(message)
+            await websocket.send_bytes(message)
         except Exception as e:
-            logging.error(f"Error sending personal message: {e}")
+            logger.error("Error sending personal message: %s", e)
             self.disconnect(websocket)
 
-    async def broadcast(self, message: str):
-        disconnected_clients = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logging.error(f"Error broadcasting to client: {e}")
-                disconnected_clients.append(connection)
+    async def broadcast(self, message: bytes):
+        # Send to every client concurrently so one slow socket doesn't delay the others.
+        # Binary frames skip the per-client UTF-8 validation that text frames require.
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_bytes(message) for connection in connections),
+            return_exceptions=True
+        )
         
-        # Remove disconnected clients
-        for client in disconnected_clients:
-            self.disconnect(client)
+        # Remove disconnected clients in one set operation and log the burst once
+        dead_connections = {
+            connection for connection, result in zip(connections, results)
+            if isinstance(result, Exception)
+        }
+        if dead_connections:
+            self.active_connections -= dead_connections
+            logger.error("Error broadcasting to %d client(s); removed them. Total connections: %d",
+                         len(dead_connections), len(self.active_connections))
 
     async def broadcast_json(self, data: Dict[Any, Any]):
-        message = json.dumps(data)
-        await self.broadcast(message)
+        # Stamp once here so callers don't each build their own timestamp
+        data.setdefault("timestamp", current_timestamp())
+        # Serialize once for all clients; orjson is several times faster than the stdlib encoder
+        message = orjson.dumps(data)
+        
+        if self.outbox is None:
+            # Broadcaster not running (e.g. app used without lifespan); send inline
+            await self.broadcast(message)
+            return
+        
+        try:
+            self.outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            # Clients are far behind; drop the oldest pending message to bound memory
+            self.outbox.get_nowait()
+            self.outbox.put_nowait(message)
+            logger.warning("Broadcast queue full; dropped the oldest pending message")
 
 manager = ConnectionManager()
 
+def next_poll_interval(interval: float, found_new_items: bool) -> float:
+    """Reset the backoff interval after new items, otherwise double it up to MAX_POLL_INTERVAL."""
+    if found_new_items:
+        return POLL_INTERVAL
+    return min(MAX_POLL_INTERVAL, interval * 2)
+
 # Background polling function
 async def poll_for_new_items():
     """Background task that continuously polls for new items"""
     global polling_active
     
+    interval = POLL_INTERVAL
+    loop = asyncio.get_running_loop()
+    # Conditional-GET validators are kept for the lifetime of this polling run.
+    # The first tracking import (DB init, browser deps) happens on the worker too.
+    feed_state = await loop.run_in_executor(tracking_executor, lambda: get_tracking().FeedState())
+    
     while polling_active:
+        poll_started = loop.time()
         try:
-            logging.info(f"Polling for new items from: {polling_url}")
-            new_items = get_new_items(polling_url)
+            logger.info("Polling for new items from: %s", polling_url)
+            # Fetch + parse + SQLite are blocking; run them off the event loop thread
+            new_items = await loop.run_in_executor(
+                tracking_executor, get_tracking().get_new_items, polling_url, feed_state
+            )
+            interval = next_poll_interval(interval, bool(new_items))
             
             if new_items:
-                logging.info(f"✓ Found {len(new_items)} new items during polling")
-                
-                # Log the titles of new items
-                for item in new_items:
-                    logging.info(f"  - New item: {item['title'][:60]}...")
+                # One aggregated line instead of a log call per item
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("✓ Found %d new items during polling: %s",
+                                len(new_items), ", ".join(item['title'][:40] for item in new_items[:5]))
                 
-                # Format items for WebSocket transmission
+                # Tracking items already carry exactly the fields clients expect
                 items_data = {
                     "type": "new_items",
-                    "items": [
-                        {
-                            "timestamp": item["timestamp"],
-                            "title": item["title"],
-                            "description": item["description"],
-                            "link": item["link"],
-                            "identifier": item["identifier"]
-                        }
-                        for item in new_items
-                    ],
-                    "count": len(new_items),
-                    "timestamp": datetime.now().isoformat()
+                    "items": new_items,
+                    "count": len(new_items)
                 }
                 
+                # Keep the served latest items current; the next connect re-serializes them
+                merge_new_items(new_items)
+                
                 # Broadcast to all connected clients
                 await manager.broadcast_json(items_data)
-                logging.info(f"✓ Broadcasted {len(new_items)} new items to {len(manager.active_connections)} connected clients")
+                logger.info("✓ Queued broadcast of %d new items to %d connected clients",
+                            len(new_items), len(manager.active_connections))
             else:
-                logging.info("No new items found during polling")
+                logger.info("No new items found during polling")
                 
         except Exception as e:
-            logging.error(f"✗ Error during polling: {e}")
+            logger.error("✗ Error during polling: %s", e)
+            interval = next_poll_interval(interval, False)
             error_data = {
                 "type": "error",
-                "message": f"Polling error: {str(e)}",
-                "timestamp": datetime.now().isoformat()
+                "message": f"Polling error: {str(e)}"
             }
             await manager.broadcast_json(error_data)
         
-        # Wait before next poll (5 seconds)
-        await asyncio.sleep(5)
+        # Wait before next poll: jittered backoff, but never sooner than the server asked for
+        delay = random.uniform(POLL_INTERVAL, interval)
+        delay = max(delay, min(feed_state.delay_hint or 0, MAX_POLL_INTERVAL))
+        
+        # Subtract the time spent fetching so the cadence doesn't drift with NSE response time
+        elapsed = loop.time() - poll_started
+        await asyncio.sleep(max(0, delay - elapsed))
 
-def get_latest_items_sorted(items: List[Dict], limit: int = 100) -> List[Dict]:
+def get_latest_items_sorted(items: Sequence[Dict], limit: int = 100) -> List[Dict]:
     """
-    Sort items by timestamp (latest first) and return up to 'limit' items.
-    Handles various timestamp formats gracefully.
+    Return up to 'limit' items ordered by publication time (latest first).
+    Sorts on the integer published_at parsed once by tracking at ingestion.
     """
-    def parse_timestamp(timestamp_str: str) -> datetime:
-        """Parse timestamp string into datetime object for sorting."""
-        if not timestamp_str:
-            return datetime.min
-        
-        try:
-            # Try parsing RFC 2822 format (common in RSS feeds)
-            return parsedate_to_datetime(timestamp_str)
-        except (ValueError, TypeError):
-            try:
-                # Try ISO format
-                return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                try:
-                    # Try common formats including the NSE format
-                    for fmt in [
-                        '%d-%b-%Y %H:%M:%S',  # 29-May-2025 07:00:00
-                        '%Y-%m-%d %H:%M:%S',
-                        '%Y-%m-%d',
-                        '%d-%m-%Y %H:%M:%S',
-                        '%d-%m-%Y'
-                    ]:
-                        return datetime.strptime(timestamp_str, fmt)
-                except (ValueError, TypeError):
-                    pass
-        
-        # If all parsing fails, return minimum datetime to sort to end
-        logging.warning(f"Could not parse timestamp: {timestamp_str}")
-        return datetime.min
-    
     try:
-        # Sort items by timestamp (latest first) and limit to specified number
-        sorted_items = sorted(
-            items,
-            key=lambda x: parse_timestamp(x.get("timestamp", "")),
-            reverse=True
-        )
-        return sorted_items[:limit]
+        # Select the latest 'limit' items without sorting the whole list (O(N log K))
+        return heapq.nlargest(limit, items, key=itemgetter("published_at"))
     except Exception as e:
-        logging.error(f"Error sorting items: {e}")
+        logger.error("Error sorting items: %s", e)
         # Return last 'limit' items if sorting fails
-        return items[-limit:] if len(items) > limit else items
+        return list(items[-limit:])
+
+async def get_latest_items() -> List[Dict]:
+    """
+    Return the latest items, reading them from tracking on first use.
+    The read (and the first import of tracking) runs on the tracking worker; the lock makes
+    concurrent first callers wait for that single read instead of queueing their own.
+    """
+    global latest_items, latest_items_lock
+    
+    if latest_items is not None:
+        return latest_items
+    
+    if latest_items_lock is None:
+        latest_items_lock = asyncio.Lock()
+    
+    async with latest_items_lock:
+        if latest_items is None:
+            items = await asyncio.get_running_loop().run_in_executor(
+                tracking_executor, lambda: get_tracking().get_initial_items()
+            )
+            latest_items = get_latest_items_sorted(items, limit=LATEST_ITEMS_LIMIT)
+    return latest_items
+
+def merge_new_items(new_items: List[Dict]):
+    """Fold newly found items into the latest items and drop their stale serialized form."""
+    global latest_items, initial_items_cache
+    
+    # Not loaded yet: the first read will come from tracking, which already has them
+    if latest_items is not None:
+        # New items go first so they win timestamp ties; a bounded merge instead of a full reload
+        latest_items = get_latest_items_sorted(new_items + latest_items, limit=LATEST_ITEMS_LIMIT)
+    initial_items_cache = None
+
+async def get_initial_items_payload() -> Tuple[orjson.Fragment, int]:
+    """Return the latest items pre-serialized for the initial_data message, building them on a cache miss."""
+    global initial_items_cache
+    
+    if initial_items_cache is None:
+        items = await get_latest_items()
+        initial_items_cache = (orjson.Fragment(orjson.dumps(items)), len(items))
+    return initial_items_cache
 
 # API Endpoints
 @app.get("/", response_model=Dict[str, str])
@@ -253,41 +396,29 @@ async def root():
         "version": "1.0.0"
     }
 
-@app.get("/items", response_model=ItemsResponse)
-async def get_items():
+@app.get("/items")
+async def get_items() -> ORJSONResponse:
     """Get the latest 100 items from the database, sorted by date (latest first)"""
     try:
-        all_items = get_initial_items()
-        latest_items = get_latest_items_sorted(all_items, limit=100)
+        items = await get_latest_items()
         
-        return ItemsResponse(
-            items=[
-                Item(
-                    timestamp=item["timestamp"],
-                    title=item["title"],
-                    description=item["description"],
-                    link=item["link"],
-                    identifier=item["identifier"]
-                )
-                for item in latest_items
-            ],
-            count=len(latest_items)
-        )
+        # Returning the response directly skips per-item model construction and jsonable_encoder
+        return ORJSONResponse({"items": items, "count": len(items)})
     except Exception as e:
-        logging.error(f"Error getting items: {e}")
+        logger.error("Error getting items: %s", e)
         raise
 
-@app.get("/status", response_model=StatusResponse)
-async def get_status():
+@app.get("/status")
+async def get_status() -> ORJSONResponse:
     """Get current polling status and connection count"""
-    return StatusResponse(
-        polling_active=polling_active,
-        connected_clients=len(manager.active_connections),
-        url=polling_url
-    )
+    return ORJSONResponse({
+        "polling_active": polling_active,
+        "connected_clients": len(manager.active_connections),
+        "url": polling_url
+    })
 
 @app.post("/start-polling")
-async def start_polling(request: StartPollingRequest, background_tasks: BackgroundTasks):
+async def start_polling(request: StartPollingRequest):
     """Start polling for new items"""
     global polling_active, polling_url, polling_task
     
@@ -300,14 +431,13 @@ async def start_polling(request: StartPollingRequest, background_tasks: Backgrou
     # Start the polling task
     polling_task = asyncio.create_task(poll_for_new_items())
     
-    logging.info(f"Started polling from: {polling_url}")
+    logger.info("Started polling from: %s", polling_url)
     
     # Notify connected clients
     status_data = {
         "type": "status_update",
         "polling_active": True,
-        "url": polling_url,
-        "timestamp": datetime.now().isoformat()
+        "url": polling_url
     }
     await manager.broadcast_json(status_data)
     
@@ -331,19 +461,50 @@ async def stop_polling():
         except asyncio.CancelledError:
             pass
     
-    logging.info("Stopped polling")
+    logger.info("Stopped polling")
     
     # Notify connected clients
     status_data = {
         "type": "status_update",
         "polling_active": False,
-        "url": polling_url,
-        "timestamp": datetime.now().isoformat()
+        "url": polling_url
     }
     await manager.broadcast_json(status_data)
     
     return {"message": "Polling stopped", "status": "success"}
 
+# WebSocket message handlers: each takes the decoded client message and returns the serialized reply
+
+# Only the timestamp of a pong varies, so it is formatted into a fixed template
+PONG_TEMPLATE = b'{"type":"pong","timestamp":"%s"}'
+
+def handle_ping(message: Any) -> bytes:
+    """Respond to ping with pong"""
+    return PONG_TEMPLATE % current_timestamp().encode()
+
+def handle_get_status(message: Any) -> bytes:
+    """Send current status"""
+    return orjson.dumps({
+        "type": "status_response",
+        "polling_active": polling_active,
+        "connected_clients": len(manager.active_connections),
+        "url": polling_url,
+        "timestamp": current_timestamp()
+    })
+
+def handle_echo(message: Any) -> bytes:
+    """Echo unknown or non-JSON messages"""
+    return orjson.dumps({
+        "type": "echo",
+        "original_message": message,
+        "timestamp": current_timestamp()
+    })
+
+WS_MESSAGE_HANDLERS: Dict[str, Callable[[Any], bytes]] = {
+    "ping": handle_ping,
+    "get_status": handle_get_status,
+}
+
 # WebSocket endpoint
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -352,78 +513,51 @@ async def websocket_endpoint(websocket: WebSocket):
     
     try:
         # Send initial data to the newly connected client
-        all_initial_items = get_initial_items()
-        latest_items = get_latest_items_sorted(all_initial_items, limit=100)
+        # The items array is serialized once and shared by every connect until new items arrive
+        items_payload, items_count = await get_initial_items_payload()
         
         initial_data = {
             "type": "initial_data",
-            "items": [
-                {
-                    "timestamp": item["timestamp"],
-                    "title": item["title"],
-                    "description": item["description"],
-                    "link": item["link"],
-                    "identifier": item["identifier"]
-                }
-                for item in latest_items
-            ],
-            "count": len(latest_items),
+            "items": items_payload,
+            "count": items_count,
             "polling_active": polling_active,
             "url": polling_url,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": current_timestamp()
         }
-        await manager.send_personal_message(json.dumps(initial_data), websocket)
+        await manager.send_personal_message(orjson.dumps(initial_data), websocket)
         
         # Keep connection alive and handle incoming messages
         while True:
-            # Receive message from client (could be ping, status request, etc.)
-            data = await websocket.receive_text()
+            # Receive message from client (could be ping, status request, etc.); text or binary frames
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            data = frame.get("text") if frame.get("text") is not None else frame.get("bytes")
             
             try:
-                message = json.loads(data)
-                
-                if message.get("type") == "ping":
-                    # Respond to ping with pong
-                    pong_response = {
-                        "type": "pong",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    await manager.send_personal_message(json.dumps(pong_response), websocket)
-                
-                elif message.get("type") == "get_status":
-                    # Send current status
-                    status_response = {
-                        "type": "status_response",
-                        "polling_active": polling_active,
-                        "connected_clients": len(manager.active_connections),
-                        "url": polling_url,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    await manager.send_personal_message(json.dumps(status_response), websocket)
-                
-                else:
-                    # Echo unknown messages
-                    echo_response = {
-                        "type": "echo",
-                        "original_message": message,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    await manager.send_personal_message(json.dumps(echo_response), websocket)
-                    
-            except json.JSONDecodeError:
+                message = orjson.loads(data)
+            except orjson.JSONDecodeError:
                 # Handle non-JSON messages
-                echo_response = {
-                    "type": "echo",
-                    "original_message": data,
-                    "timestamp": datetime.now().isoformat()
-                }
-                await manager.send_personal_message(json.dumps(echo_response), websocket)
+                if isinstance(data, bytes):
+                    data = data.decode('utf-8', errors='replace')
+                await manager.send_personal_message(handle_echo(data), websocket)
+                continue
+            
+            # Only string types can name a handler; anything else (lists, objects, numbers) is echoed
+            message_type = message.get("type") if isinstance(message, dict) else None
+            handler = WS_MESSAGE_HANDLERS.get(message_type) if isinstance(message_type, str) else None
+            await manager.send_personal_message((handler or handle_echo)(message), websocket)
                 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
-        logging.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         manager.disconnect(websocket)
+        # Close with "internal error" so the client is not left waiting on a dead handler
+        try:
+            await websocket.close(code=1011)
+        except Exception:
+            pass  # the socket was already closed
 
 # Health check endpoint
 @app.get("/health")
@@ -431,11 +565,19 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": current_timestamp(),
         "polling_active": polling_active,
         "connected_clients": len(manager.active_connections)
     }
 
+def preferred_event_loop() -> str:
+    """Return the uvicorn loop implementation to use: uvloop when installed, asyncio otherwise (e.g. Windows)."""
+    try:
+        import uvloop  # noqa: F401
+        return "uvloop"
+    except ImportError:
+        return "asyncio"
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -445,5 +587,6 @@ if __name__ == "__main__":
         host="localhost",
         port=5127,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop=preferred_event_loop()
     ) 
\ No newline at end of file
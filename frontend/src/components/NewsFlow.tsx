@@ -51,11 +51,11 @@ const sortItemsByTimestamp = (items: NewsItemType[]): NewsItemType[] => {
     return new Date(0);
   };
 
-  return items.sort((a, b) => {
-    const dateA = parseTimestamp(a.timestamp);
-    const dateB = parseTimestamp(b.timestamp);
-    return dateB.getTime() - dateA.getTime(); // Latest first
-  });
+  // Prefer the epoch seconds the server parsed at ingestion; fall back to the raw string
+  const publishedTime = (item: NewsItemType): number =>
+    item.published_at ? item.published_at * 1000 : parseTimestamp(item.timestamp).getTime();
+
+  return items.sort((a, b) => publishedTime(b) - publishedTime(a)); // Latest first
 };
 
 export const NewsFlow: React.FC<NewsFlowProps> = ({ items, isConnected }) => {
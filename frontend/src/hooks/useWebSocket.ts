@@ -6,6 +6,7 @@ export interface NewsItem {
   description: string;
   link: string;
   identifier: string;
+  published_at?: number;
 }
 
 export interface WebSocketMessage {
@@ -29,6 +30,9 @@ export interface WebSocketState {
 // Constants for item limits
 const MAX_ITEMS_IN_STATE = 5000;
 
+// The server sends JSON as binary frames; decode them back to text before parsing
+const frameDecoder = new TextDecoder();
+
 // Utility function to sort items by timestamp (latest first)
 const sortItemsByTimestamp = (items: NewsItem[]): NewsItem[] => {
   const parseTimestamp = (timestamp: string): Date => {
@@ -70,11 +74,11 @@ const sortItemsByTimestamp = (items: NewsItem[]): NewsItem[] => {
     return new Date(0);
   };
 
-  return items.sort((a, b) => {
-    const dateA = parseTimestamp(a.timestamp);
-    const dateB = parseTimestamp(b.timestamp);
-    return dateB.getTime() - dateA.getTime(); // Latest first
-  });
+  // Prefer the epoch seconds the server parsed at ingestion; fall back to the raw string
+  const publishedTime = (item: NewsItem): number =>
+    item.published_at ? item.published_at * 1000 : parseTimestamp(item.timestamp).getTime();
+
+  return items.sort((a, b) => publishedTime(b) - publishedTime(a)); // Latest first
 };
 
 // Utility function to limit items array to max count, keeping latest items
@@ -108,6 +112,7 @@ export const useWebSocket = (url: string) => {
 
     try {
       const ws = new WebSocket(url);
+      ws.binaryType = 'arraybuffer';
       wsRef.current = ws;
 
       ws.onopen = () => {
@@ -123,7 +128,8 @@ export const useWebSocket = (url: string) => {
 
       ws.onmessage = (event) => {
         try {
-          const message: WebSocketMessage = JSON.parse(event.data);
+          const raw = typeof event.data === 'string' ? event.data : frameDecoder.decode(event.data);
+          const message: WebSocketMessage = JSON.parse(raw);
           console.log('Received message:', message);
 
           setState(prev => {
@@ -8,7 +8,6 @@ React applications can connect to this localhost server to get real-time NSE ann
 
 import sys
 import os
-import asyncio
 import logging
 import threading
 import time
@@ -35,22 +34,18 @@ sys.path.insert(0, current_dir)
 
 try:
     import uvicorn
-    from fastapi_server import app
-    from tracking import get_initial_items, get_new_items
+    from fastapi_server import app, configure_logging, preferred_event_loop
 except ImportError as e:
     print(f"Error importing required modules: {e}")
     print("Please ensure all dependencies are installed.")
     input("Press Enter to exit...")
     sys.exit(1)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(os.path.join(current_dir, 'nse_tracker.log'), mode='a')
-    ]
+# Configure logging. Records are queued and written to the console and the log file by
+# fastapi_server's listener thread, so logging never blocks on file I/O.
+configure_logging(
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler(os.path.join(current_dir, 'nse_tracker.log'), mode='a')
 )
 
 logger = logging.getLogger(__name__)
@@ -60,11 +55,12 @@ class NSETrackerServer:
         self.host = host
         self.port = port
         self.server = None
-        self.server_thread = None
-        self.running = False
         
-    def start_server(self):
-        """Start the FastAPI server in a separate thread"""
+    def run(self):
+        """
+        Run the FastAPI server on the calling (main) thread until it shuts down.
+        Returns False if the server never started.
+        """
         try:
             logger.info(f"Starting NSE Tracker Server on {self.host}:{self.port}")
             logger.info("=" * 50)
@@ -80,44 +76,38 @@ class NSETrackerServer:
             logger.info(f"  - GET  /health         - Health check")
             logger.info("=" * 50)
             
-            # Test initial functionality
-            logger.info("Testing initial functionality...")
-            initial_items = get_initial_items()
-            logger.info(f"Database contains {len(initial_items)} items")
+            # tracking (SQLite init, SeleniumBase) is imported by the server on its worker
+            # thread when first needed, and logs the stored item count when it loads
             
+            # uvloop (where available) and httptools take the event loop and HTTP parsing
+            # off pure Python; per-request access logging is left off the hot path
             config = uvicorn.Config(
                 app,
                 host=self.host,
                 port=self.port,
-                log_level="info",
-                access_log=True
+                log_level="warning",
+                access_log=False,
+                loop=preferred_event_loop(),
+                http="httptools",
+                ws="websockets"
             )
             
             self.server = uvicorn.Server(config)
-            self.running = True
             
-            # Run the server
+            # Server.run() sets up the configured loop and asyncio.run()s the server here,
+            # so uvicorn's own signal handlers give a clean Ctrl+C shutdown
             self.server.run()
             
-        except Exception as e:
-            logger.error(f"Error starting server: {e}")
-            self.running = False
-            
-    def start_in_thread(self):
-        """Start the server in a background thread"""
-        self.server_thread = threading.Thread(target=self.start_server, daemon=True)
-        self.server_thread.start()
-        
-        # Wait a moment for server to start
-        time.sleep(2)
+        except (Exception, SystemExit) as e:
+            # uvicorn exits via SystemExit when it cannot bind the port
+            logger.error(f"Error running server: {e}")
         
-        return self.running
+        return self.server is not None and self.server.started
         
     def stop_server(self):
         """Stop the server"""
         if self.server:
             logger.info("Stopping server...")
-            self.running = False
             self.server.should_exit = True
 
 def open_browser(url, delay=3):
@@ -140,42 +130,37 @@ def main():
     server = NSETrackerServer()
     
     try:
-        # Start server
-        if server.start_in_thread():
-            print("✅ Server started successfully!")
-            print()
-            print("Available endpoints:")
-            print("  🌐 Main API: http://localhost:5127")
-            print("  📡 WebSocket: ws://localhost:5127/ws")
-            print("  📊 Status: http://localhost:5127/status")
-            print("  💓 Health: http://localhost:5127/health")
-            print()
-            print("To connect your React app, use:")
-            print("  Fetch API: fetch('http://localhost:5127/items')")
-            print("  WebSocket: new WebSocket('ws://localhost:5127/ws')")
-            print()
-            print("Press Ctrl+C to stop the server")
-            print("=" * 60)
-            
-            # Optional: Open browser to API documentation
-            browser_thread = threading.Thread(
-                target=open_browser, 
-                args=("http://localhost:5127",), 
-                daemon=True
-            )
-            browser_thread.start()
-            
-            # Keep the main thread alive
-            try:
-                while server.running:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                print("\n\n⏹️  Shutdown requested by user...")
-                
-        else:
+        print("🚀 Starting server...")
+        print()
+        print("Available endpoints:")
+        print("  🌐 Main API: http://localhost:5127")
+        print("  📡 WebSocket: ws://localhost:5127/ws")
+        print("  📊 Status: http://localhost:5127/status")
+        print("  💓 Health: http://localhost:5127/health")
+        print()
+        print("To connect your React app, use:")
+        print("  Fetch API: fetch('http://localhost:5127/items')")
+        print("  WebSocket: new WebSocket('ws://localhost:5127/ws')")
+        print()
+        print("Press Ctrl+C to stop the server")
+        print("=" * 60)
+        
+        # Optional: Open browser to API documentation
+        browser_thread = threading.Thread(
+            target=open_browser, 
+            args=("http://localhost:5127",), 
+            daemon=True
+        )
+        browser_thread.start()
+        
+        # Blocks until the server shuts down
+        if not server.run():
             print("❌ Failed to start server!")
             return 1
             
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Shutdown requested by user...")
+            
     except Exception as e:
         print(f"❌ Error: {e}")
         logger.error(f"Fatal error: {e}")
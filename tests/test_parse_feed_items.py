@@ -0,0 +1,50 @@
+import tracking
+
+PUB_DATE = "Mon, 13 Oct 2025 10:00:00 +0000"
+
+
+def parse(content):
+    return list(tracking.parse_feed_items(content))
+
+
+def test_recover_mode_unclosed_link_keeps_fields_apart():
+    # <link> is never closed, so the recovering parser nests description and pubDate inside it
+    content = (
+        "<rss><channel><item><title>Title A</title><link>https://example.com/a"
+        f"<description>Desc <b>bold</b></description><pubDate>{PUB_DATE}</pubDate></item>"
+        "</channel></rss>"
+    )
+    [fields] = parse(content)
+
+    assert fields["link"].strip() == "https://example.com/a"
+    assert fields["description"] == "Desc bold"
+    assert fields["pubDate"] == PUB_DATE
+
+
+def test_html_fallback_fields():
+    # Upper-case tags are not <item> to the XML parsers, so this goes through the HTML parser
+    content = (
+        "<html><body><ITEM><TITLE>Title B</TITLE><LINK>https://example.com/b"
+        f"<DESCRIPTION>Desc B</DESCRIPTION><PUBDATE>{PUB_DATE}</PUBDATE></ITEM></body></html>"
+    )
+    [fields] = parse(content.encode("utf-8"))
+
+    assert fields["link"].strip() == "https://example.com/b"
+    assert fields["title"] == "Title B"
+    assert fields["description"] == "Desc B"
+    assert fields["pubDate"] == PUB_DATE
+
+
+def test_streamed_feed_keeps_text_after_inline_markup():
+    # Well-formed feed, so this goes through the streaming parser rather than a fallback
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss><channel><item><title>Title <i>C</i> rises</title>'
+        "<link>https://example.com/c</link><description>Desc <b>bold</b> tail</description>"
+        f"<pubDate>{PUB_DATE}</pubDate></item></channel></rss>"
+    )
+    [fields] = parse(content.encode("utf-8"))
+
+    assert fields["title"] == "Title C rises"
+    assert fields["link"] == "https://example.com/c"
+    assert fields["description"] == "Desc bold tail"
+    assert fields["pubDate"] == PUB_DATE
@@ -0,0 +1,177 @@
+import functools
+import sqlite3
+from collections import OrderedDict, deque
+
+import pytest
+
+import tracking
+
+FEED_URL = "https://example.com/feed.xml"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Stands in for tracking.http_session: records requests and returns a canned response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.headers = {}
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        return self.response
+
+
+def feed(*items):
+    body = "".join(
+        f"<item><title>{title}</title><link>{link}</link><description>{title} desc</description>"
+        f"<pubDate>{pub_date}</pubDate></item>"
+        for title, link, pub_date in items
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss><channel>{body}</channel></rss>'.encode("utf-8")
+
+
+def stored_item(link, published_at):
+    return {
+        "timestamp": "",
+        "title": "Stored",
+        "description": "",
+        "link": link,
+        "identifier": link,
+        "published_at": published_at,
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "seen_items.db")
+    tracking.init_database(path)
+    yield path
+    with tracking.db_lock:
+        tracking.db_connections.pop(path).close()
+
+
+@pytest.fixture
+def tracker(monkeypatch, db_path):
+    """get_new_items against an empty temporary database, with no network and no browser."""
+    monkeypatch.setattr(tracking, "seen_item_objects_list", deque(maxlen=tracking.MAX_STORED_IDENTIFIERS))
+    monkeypatch.setattr(tracking, "seen_item_identifiers", OrderedDict())
+    monkeypatch.setattr(tracking, "inserts_since_trim", 0)
+    monkeypatch.setattr(tracking, "batch_add_new_items",
+                        functools.partial(tracking.batch_add_new_items, db_path=db_path))
+    monkeypatch.setattr(tracking, "save_seen_items",
+                        functools.partial(tracking.save_seen_items, db_path=db_path))
+
+    browser_calls = []
+    monkeypatch.setattr(tracking, "fetch_content", lambda url: browser_calls.append(url))
+
+    def serve(response):
+        session = FakeSession(response)
+        monkeypatch.setattr(tracking, "http_session", session)
+        return session
+
+    serve.browser_calls = browser_calls
+    return serve
+
+
+def test_not_modified_skips_parser_and_browser(tracker):
+    session = tracker(FakeResponse(304))
+    feed_state = tracking.FeedState()
+    feed_state.etag = '"v1"'
+
+    assert tracking.get_new_items(FEED_URL, feed_state) == []
+    assert session.requests[0]["If-None-Match"] == '"v1"'
+    assert tracker.browser_calls == []
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_rate_limited_backs_off_without_browser(tracker, status_code):
+    tracker(FakeResponse(status_code, b"Too many requests", {"Retry-After": "120"}))
+    feed_state = tracking.FeedState()
+
+    assert tracking.get_new_items(FEED_URL, feed_state) == []
+    assert feed_state.delay_hint == 120
+    assert tracker.browser_calls == []
+
+
+def test_published_cutoff_stops_at_old_items(tracker):
+    latest = tracking.parse_published_at("Mon, 13 Oct 2025 10:00:00 +0000")
+    tracking.seen_item_objects_list.append(stored_item("https://example.com/stored", latest))
+    tracker(FakeResponse(200, feed(
+        ("New", "https://example.com/new", "Mon, 13 Oct 2025 11:00:00 +0000"),
+        # Unknown, but published well before the newest stored item: the scan stops here
+        ("Old", "https://example.com/old", "Mon, 13 Oct 2025 07:00:00 +0000"),
+        ("Older", "https://example.com/older", "Mon, 13 Oct 2025 06:00:00 +0000"),
+    ), {"ETag": '"v2"'}))
+    feed_state = tracking.FeedState()
+
+    new_items = tracking.get_new_items(FEED_URL, feed_state)
+
+    assert [item["link"] for item in new_items] == ["https://example.com/new"]
+    assert feed_state.etag == '"v2"'
+    assert tracker.browser_calls == []
+
+
+def test_batch_add_returns_only_inserted_items(monkeypatch, db_path):
+    # Small chunks so the batch spans several multi-row INSERT ... RETURNING statements
+    monkeypatch.setattr(tracking, "INSERT_CHUNK_ROWS", 2)
+    stored = [stored_item(f"https://example.com/{i}", i) for i in range(3)]
+    assert tracking.batch_add_new_items(stored, db_path=db_path) == stored
+
+    fresh = [stored_item(f"https://example.com/{i}", i) for i in range(3, 6)]
+    batch = stored[1:] + fresh + fresh[:1]  # known items plus a duplicate within the batch
+    assert tracking.batch_add_new_items(batch, db_path=db_path) == fresh
+
+    with tracking.database(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM seen_items").fetchone()[0] == 6
+
+
+def test_init_database_migrates_legacy_schema(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    # rowid schema from before published_at existed
+    conn.execute("""
+        CREATE TABLE seen_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            identifier TEXT UNIQUE,
+            timestamp TEXT,
+            title TEXT,
+            description TEXT,
+            link TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO seen_items (identifier, timestamp, title, description, link) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("https://Example.com/a/?utm_source=rss", "29-May-2025 07:00:00", "A", "",
+             "https://Example.com/a/?utm_source=rss"),
+            ("0" * 64, "", "B", "B desc", None),  # link-less item under the old SHA-256 identifier
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    try:
+        tracking.init_database(path)
+        with tracking.database(path) as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(seen_items)")}
+            table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'seen_items'").fetchone()[0]
+            rows = dict(conn.execute("SELECT identifier, published_at FROM seen_items"))
+    finally:
+        with tracking.db_lock:
+            tracking.db_connections.pop(path).close()
+
+    assert "id" not in columns
+    assert "WITHOUT ROWID" in table_sql
+    assert rows == {
+        "https://example.com/a": tracking.parse_published_at("29-May-2025 07:00:00"),
+        tracking.content_identifier("B", "B desc"): 0,
+    }
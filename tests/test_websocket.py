@@ -0,0 +1,34 @@
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import fastapi_server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Pretend the latest items are already loaded so connecting never touches tracking/SQLite
+    monkeypatch.setattr(fastapi_server, "latest_items", [])
+    monkeypatch.setattr(fastapi_server, "initial_items_cache", None)
+    with TestClient(fastapi_server.app) as test_client:
+        yield test_client
+
+
+@pytest.mark.parametrize("message_type", [["x"], {}, 1, None])
+def test_non_string_type_is_echoed(client, message_type):
+    message = {"type": message_type}
+    with client.websocket_connect("/ws") as websocket:
+        assert orjson.loads(websocket.receive_bytes())["type"] == "initial_data"
+
+        websocket.send_text(orjson.dumps(message).decode())
+        reply = orjson.loads(websocket.receive_bytes())
+
+    assert reply["type"] == "echo"
+    assert reply["original_message"] == message
+
+
+def test_ping_still_dispatched(client):
+    with client.websocket_connect("/ws") as websocket:
+        websocket.receive_bytes()
+        websocket.send_text('{"type": "ping"}')
+        assert orjson.loads(websocket.receive_bytes())["type"] == "pong"
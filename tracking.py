@@ -1,16 +1,25 @@
 import requests
-from bs4 import BeautifulSoup
+import atexit
 import datetime
 import logging
 import hashlib
+import itertools
 import sqlite3
-import json
 import os
+import re
 import sys  # Add sys import for executable detection
+import threading
 import random # Keep for now, might not be needed with SB UC
 import time # Keep for potential waits if needed
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
 
-from seleniumbase import Driver
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -31,318 +40,396 @@ def get_script_directory():
     return script_dir
 
 SCRIPT_DIR = get_script_directory()
-DATABASE_FILE = os.path.join(SCRIPT_DIR, 'seen_items.db') # SQLite database file
+DATABASE_FILE = os.path.join(SCRIPT_DIR, 'seen_items.db') # SQLite database file (absolute, so it is logged as-is)
 MAX_STORED_IDENTIFIERS = 100
+# The table may grow this far past MAX_STORED_IDENTIFIERS before it is compacted back down,
+# so the trimming DELETE runs once every ~50 new items instead of on every batch
+STORAGE_COMPACTION_SLACK = 0.5
+# save_seen_items (its COUNT and possible trim) only runs once this many rows have been inserted
+TRIM_CHECK_INTERVAL = MAX_STORED_IDENTIFIERS // 4
+inserts_since_trim = 0
 # In-memory cache for recent identifiers (keep more in memory for faster lookups)
 MEMORY_CACHE_SIZE = 500
+# Feed items published this long before the newest stored item may still be new (the feed is not
+# strictly ordered by pubDate); anything older ends the scan of the feed
+PUBLISHED_AT_GRACE_SECONDS = 2 * 60 * 60
+
+# Shared HTTP session for conditional feed requests (keeps the connection alive between polls)
+http_session = requests.Session()
+# Retry transient server errors and dropped connections on the same pooled connection. 429/503
+# are left alone: they mean "back off" or a challenge page, handled by the delay hint and the
+# browser fallback. The final response is returned rather than raised (raise_on_status=False).
+http_session.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=3, backoff_factor=0.3, status_forcelist=(500, 502, 504), raise_on_status=False
+)))
 
 # Browser session management
 persistent_browser = None
 browser_refresh_counter = 0
+# Guards the browser session; reentrant because fetch/init paths call cleanup while holding it
+browser_lock = threading.RLock()
 MAX_BROWSER_REUSES = 20  # Refresh browser after 20 uses
 
+# Feed timestamp formats seen in practice; anything else is tried as RFC 2822 (RSS pubDate)
+ISO_TIMESTAMP_RE = re.compile(r'^\d{4}-\d{2}-\d{2}')        # 2025-05-29 07:00:00 / ISO 8601
+NSE_TIMESTAMP_RE = re.compile(r'^\d{1,2}-[A-Za-z]{3}-\d{4}')  # 29-May-2025 07:00:00
+DMY_TIMESTAMP_RE = re.compile(r'^\d{1,2}-\d{1,2}-\d{4}')     # 29-05-2025 07:00:00
+
+def parse_published_at(pub_date):
+    """
+    Parse a feed pubDate string into integer epoch seconds, once at ingestion, so sorting
+    never has to re-parse the string. Missing or unparseable dates return 0 (sort last).
+    """
+    if not pub_date:
+        return 0
+    
+    try:
+        if ISO_TIMESTAMP_RE.match(pub_date):
+            parsed = datetime.datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
+        elif NSE_TIMESTAMP_RE.match(pub_date):
+            parsed = datetime.datetime.strptime(pub_date, '%d-%b-%Y %H:%M:%S')
+        elif DMY_TIMESTAMP_RE.match(pub_date):
+            fmt = '%d-%m-%Y %H:%M:%S' if ' ' in pub_date else '%d-%m-%Y'
+            parsed = datetime.datetime.strptime(pub_date, fmt)
+        else:
+            parsed = parsedate_to_datetime(pub_date)
+        return int(parsed.timestamp())
+    except (ValueError, TypeError, OverflowError):
+        logging.warning(f"Could not parse timestamp: {pub_date}")
+        return 0
+
 # --- Database Functions ---
 
+# One long-lived connection per database file, shared by the event loop and the tracking
+# executor thread; db_lock serialises access since a sqlite3 connection is not thread-safe
+db_connections = {}
+db_lock = threading.Lock()
+
+def open_database(db_path=DATABASE_FILE):
+    """Return the cached connection for db_path, opening it (WAL mode) on first use."""
+    conn = db_connections.get(db_path)
+    if conn is None:
+        # Autocommit mode: transactions are opened explicitly by database(write=True)
+        conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        # WAL + NORMAL skips the fsync on every commit; the page cache stays warm between polls
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-20000')
+        db_connections[db_path] = conn
+    return conn
+
+@contextmanager
+def database(db_path=DATABASE_FILE, write=False):
+    """
+    Hold db_lock and yield the persistent connection. With write=True the block runs in one
+    BEGIN IMMEDIATE transaction (write lock taken once, one commit for every statement),
+    committed when the block exits and rolled back if it raises.
+    """
+    with db_lock:
+        conn = open_database(db_path)
+        if not write:
+            yield conn
+            return
+        
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+def close_databases():
+    """Close every persistent database connection (registered with atexit)."""
+    with db_lock:
+        for conn in db_connections.values():
+            try:
+                # Recommended before closing: refreshes planner statistics only if they have drifted
+                conn.execute('PRAGMA optimize')
+                conn.close()
+            except sqlite3.Error as e:
+                logging.error(f"Error closing database connection: {e}")
+        db_connections.clear()
+
+atexit.register(close_databases)
+
+# Keyed on identifier with no rowid, so a lookup by identifier is a single B-tree descent
+SEEN_ITEMS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        identifier TEXT PRIMARY KEY,
+        timestamp TEXT,
+        title TEXT,
+        description TEXT,
+        link TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        published_at INTEGER
+    ) WITHOUT ROWID
+'''
+
+# Stored in PRAGMA user_version once identifiers use the current scheme (canonical links, 'b2:' hashes)
+IDENTIFIER_SCHEME_VERSION = 1
+
 def init_database(db_path=DATABASE_FILE):
     """Initialize the SQLite database and create the items table if it doesn't exist."""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Create table with unique constraint on identifier only
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS seen_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                title TEXT,
-                description TEXT,
-                link TEXT,
-                identifier TEXT UNIQUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create composite index on timestamp and identifier for faster lookups
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp_identifier ON seen_items(timestamp DESC, identifier)')
-        
-        # Create individual index on identifier for unique lookups
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_identifier ON seen_items(identifier)')
-        
-        # Create index on created_at for cleanup operations
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON seen_items(created_at DESC)')
-        
-        conn.commit()
-        conn.close()
-        logging.info(f"Database initialized with optimized indexes at: {os.path.abspath(db_path)}")
+        with database(db_path, write=True) as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(SEEN_ITEMS_SCHEMA.format(table='seen_items'))
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(seen_items)')}
+            
+            # Databases created before published_at existed: add the column and backfill it
+            if 'published_at' not in columns:
+                cursor.execute('ALTER TABLE seen_items ADD COLUMN published_at INTEGER')
+                rows = cursor.execute('SELECT id, timestamp FROM seen_items').fetchall()
+                cursor.executemany(
+                    'UPDATE seen_items SET published_at = ? WHERE id = ?',
+                    [(parse_published_at(timestamp), row_id) for row_id, timestamp in rows]
+                )
+                logging.info(f"Added published_at column and backfilled {len(rows)} items")
+            
+            # Databases from the rowid schema (id AUTOINCREMENT + UNIQUE identifier): rebuild the
+            # table keyed on identifier; its old identifier indexes are dropped along with it
+            if 'id' in columns:
+                cursor.execute(SEEN_ITEMS_SCHEMA.format(table='seen_items_rebuild'))
+                cursor.execute('''
+                    INSERT OR IGNORE INTO seen_items_rebuild
+                        (identifier, timestamp, title, description, link, created_at, published_at)
+                    SELECT identifier, timestamp, title, description, link, created_at, published_at
+                    FROM seen_items
+                    WHERE identifier IS NOT NULL
+                ''')
+                migrated_count = cursor.rowcount
+                cursor.execute('DROP TABLE seen_items')
+                cursor.execute('ALTER TABLE seen_items_rebuild RENAME TO seen_items')
+                logging.info(f"Rebuilt seen_items as a WITHOUT ROWID table keyed on identifier ({migrated_count} items)")
+            
+            # Identifiers stored before links were canonicalized and link-less items hashed with
+            # BLAKE2b: recompute them the way get_new_items does, so stored items still match
+            if cursor.execute('PRAGMA user_version').fetchone()[0] < IDENTIFIER_SCHEME_VERSION:
+                rows = cursor.execute('SELECT identifier, title, description, link FROM seen_items').fetchall()
+                migrated_count = 0
+                for identifier, title, description, link in rows:
+                    current = canonicalize_link(link) if link else content_identifier(title or '', description or '')
+                    if current == identifier:
+                        continue
+                    cursor.execute('UPDATE OR IGNORE seen_items SET identifier = ? WHERE identifier = ?',
+                                   (current, identifier))
+                    if not cursor.rowcount:
+                        # Another spelling of the same item already holds the current identifier
+                        cursor.execute('DELETE FROM seen_items WHERE identifier = ?', (identifier,))
+                    migrated_count += 1
+                cursor.execute(f'PRAGMA user_version = {IDENTIFIER_SCHEME_VERSION}')
+                if migrated_count:
+                    logging.info(f"Migrated {migrated_count} stored identifiers to the current scheme")
+            
+            # Create index on created_at for cleanup operations
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON seen_items(created_at DESC)')
+            
+            # Gather planner statistics on first setup; PRAGMA optimize keeps them current after that
+            if not cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+                cursor.execute('ANALYZE seen_items')
+        logging.info(f"Database initialized with optimized indexes at: {db_path}")
     except sqlite3.Error as e:
         logging.error(f"Error initializing database: {e}")
 
 def load_seen_items(db_path=DATABASE_FILE):
     """Loads seen item dictionaries from SQLite database with optimized in-memory caching."""
-    abs_db_path = os.path.abspath(db_path)
-    logging.info(f"Attempting to load seen items from: {abs_db_path}")
+    logging.info(f"Attempting to load seen items from: {db_path}")
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Get all items ordered by creation time (most recent first)
-        cursor.execute('''
-            SELECT timestamp, title, description, link, identifier 
-            FROM seen_items 
-            ORDER BY created_at DESC
-        ''')
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with database(db_path) as conn:
+            # Only the rows the bounded deque will keep, most recent first
+            rows = conn.execute('''
+                SELECT timestamp, title, description, link, identifier, published_at 
+                FROM seen_items 
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (MAX_STORED_IDENTIFIERS,)).fetchall()
+            # The identifier cache may cover more rows than are kept in memory as items
+            recent_identifiers = [row[0] for row in conn.execute('''
+                SELECT identifier FROM seen_items 
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (MEMORY_CACHE_SIZE,))]
         
-        # Convert to the same format as before
-        item_objects_list = []
-        # Use set for O(1) lookup, but limit size for memory efficiency
-        identifiers_set = set()
-        
-        for row in rows:
-            timestamp, title, description, link, identifier = row
-            item_object = {
+        # Keep the in-memory items oldest first in a bounded deque, so appending new items evicts
+        # the oldest. The table can hold up to the compaction slack beyond what is kept in memory.
+        item_objects_list = deque(
+            ({
                 "timestamp": timestamp,
                 "title": title,
                 "description": description,
                 "link": link,
-                "identifier": identifier
-            }
-            item_objects_list.append(item_object)
-            
-            # Only keep recent identifiers in memory cache for faster lookups
-            if len(identifiers_set) < MEMORY_CACHE_SIZE:
-                identifiers_set.add(identifier)
+                "identifier": identifier,
+                "published_at": published_at or 0
+            } for timestamp, title, description, link, identifier, published_at in reversed(rows)),
+            maxlen=MAX_STORED_IDENTIFIERS
+        )
+        # LRU of identifiers: O(1) lookups, least recently seen first
+        identifiers = OrderedDict.fromkeys(reversed(recent_identifiers))
         
-        logging.info(f"Loaded {len(item_objects_list)} items with {len(identifiers_set)} identifiers cached in memory from {abs_db_path}")
-        return item_objects_list, identifiers_set
+        logging.info(f"Loaded {len(item_objects_list)} items with {len(identifiers)} identifiers cached in memory from {db_path}")
+        return item_objects_list, identifiers
         
     except sqlite3.Error as e:
-        logging.error(f"Error loading seen items from {abs_db_path}: {e}. Starting fresh.")
-        return [], set()
+        logging.error(f"Error loading seen items from {db_path}: {e}. Starting fresh.")
+        return deque(maxlen=MAX_STORED_IDENTIFIERS), OrderedDict()
 
 def save_seen_items(item_objects_list, db_path=DATABASE_FILE, max_items=MAX_STORED_IDENTIFIERS):
-    """Saves seen item dictionaries to SQLite database, keeping only the most recent ones."""
-    abs_db_path = os.path.abspath(db_path)
+    """
+    Saves seen item dictionaries to SQLite database, keeping only the most recent ones.
+    Compaction is deferred until the table exceeds max_items by STORAGE_COMPACTION_SLACK.
+    """
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Clean up old items if we exceed max_items
-        cursor.execute('SELECT COUNT(*) FROM seen_items')
-        current_count = cursor.fetchone()[0]
-        
-        if current_count > max_items:
-            # Keep only the most recent max_items
-            cursor.execute('''
-                DELETE FROM seen_items 
-                WHERE id NOT IN (
-                    SELECT id FROM seen_items 
-                    ORDER BY created_at DESC 
-                    LIMIT ?
-                )
-            ''', (max_items,))
+        with database(db_path, write=True) as conn:
+            cursor = conn.cursor()
             
-            deleted_count = cursor.rowcount
-            logging.info(f"Trimmed seen items storage by removing {deleted_count} old items. Keeping {max_items} most recent items.")
-        
-        conn.commit()
-        conn.close()
+            # Clean up old items if we exceed max_items
+            cursor.execute('SELECT COUNT(*) FROM seen_items')
+            current_count = cursor.fetchone()[0]
+            
+            if current_count > max_items * (1 + STORAGE_COMPACTION_SLACK):
+                # Keep only the most recent max_items
+                cursor.execute('''
+                    DELETE FROM seen_items 
+                    WHERE identifier NOT IN (
+                        SELECT identifier FROM seen_items 
+                        ORDER BY created_at DESC 
+                        LIMIT ?
+                    )
+                ''', (max_items,))
+                
+                deleted_count = cursor.rowcount
+                logging.info(f"Trimmed seen items storage by removing {deleted_count} old items. Keeping {max_items} most recent items.")
+                
+                # The table just shrank: let SQLite re-analyze if its statistics are now stale
+                cursor.execute('PRAGMA optimize')
         
     except sqlite3.Error as e:
-        logging.error(f"Error trimming seen items in {abs_db_path}: {e}")
+        logging.error(f"Error trimming seen items in {db_path}: {e}")
+
+# Duplicates are rejected by the identifier primary key, so no existence check is needed first
+INSERT_ITEM_SQL = '''
+    INSERT OR IGNORE INTO seen_items (timestamp, title, description, link, identifier, published_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+# Multi-row form that reports exactly which rows went in; RETURNING needs SQLite 3.35+
+INSERT_ITEMS_RETURNING_SQL = '''
+    INSERT INTO seen_items (timestamp, title, description, link, identifier, published_at)
+    VALUES {rows}
+    ON CONFLICT(identifier) DO NOTHING
+    RETURNING identifier
+'''
+SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+# Rows per multi-row INSERT: 6 parameters each stays under SQLite's default 999-variable limit
+INSERT_CHUNK_ROWS = 150
+
+def item_row(item_object):
+    """Column values for INSERT_ITEM_SQL."""
+    return (
+        item_object['timestamp'],
+        item_object['title'],
+        item_object['description'],
+        item_object['link'],
+        item_object['identifier'],
+        item_object['published_at']
+    )
 
 def add_new_item(item_object, db_path=DATABASE_FILE):
     """Add a single new item to the SQLite database."""
-    abs_db_path = os.path.abspath(db_path)
-    logging.info(f"Attempting to add new item to database: {abs_db_path}")
-    logging.debug(f"Item details: {item_object['title'][:50]}... (ID: {item_object['identifier'][:20]}...)")
+    logging.debug("Attempting to add new item to database: %s", db_path)
+    logging.debug("Item details: %.50s... (ID: %.20s...)", item_object['title'], item_object['identifier'])
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        with database(db_path, write=True) as conn:
+            inserted = conn.execute(INSERT_ITEM_SQL, item_row(item_object)).rowcount == 1
         
-        # Check if item already exists first
-        cursor.execute('SELECT COUNT(*) FROM seen_items WHERE identifier = ?', (item_object['identifier'],))
-        existing_count = cursor.fetchone()[0]
-        
-        if existing_count > 0:
-            logging.debug(f"Item already exists in database (duplicate identifier): {item_object['title'][:50]}...")
-            conn.close()
-            return False
-        
-        # Insert the new item
-        cursor.execute('''
-            INSERT INTO seen_items (timestamp, title, description, link, identifier)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
-            item_object['timestamp'],
-            item_object['title'], 
-            item_object['description'],
-            item_object['link'],
-            item_object['identifier']
-        ))
-        
-        if cursor.rowcount > 0:
-            logging.info(f"✓ Successfully added new item to database: {item_object['title'][:50]}...")
-            conn.commit()
-            conn.close()
-            return True
+        if inserted:
+            logging.debug("✓ Successfully added new item to database: %.50s...", item_object['title'])
         else:
-            logging.warning(f"✗ Failed to add item to database (no rows affected): {item_object['title'][:50]}...")
-            conn.close()
-            return False
+            logging.debug("Item already exists in database (duplicate identifier): %.50s...", item_object['title'])
+        return inserted
         
     except sqlite3.Error as e:
         logging.error(f"✗ Database error adding item: {e}")
         return False
 
 def batch_add_new_items(item_objects_list, db_path=DATABASE_FILE):
-    """Batch insert multiple new items to SQLite database for better performance."""
+    """
+    Batch insert multiple new items to SQLite database for better performance.
+    Returns the items actually inserted, or None if the batch failed with a database error.
+    """
     if not item_objects_list:
         return []
     
-    abs_db_path = os.path.abspath(db_path)
-    logging.info(f"Attempting to batch add {len(item_objects_list)} items to database: {abs_db_path}")
+    logging.info(f"Attempting to batch add {len(item_objects_list)} items to database: {db_path}")
+    
+    # Remove duplicates within the batch itself
+    seen_in_batch = set()
+    unique_items = []
+    
+    for item in item_objects_list:
+        if item['identifier'] not in seen_in_batch:
+            unique_items.append(item)
+            seen_in_batch.add(item['identifier'])
+        else:
+            logging.debug("Duplicate within batch: %.50s...", item['title'])
+    
+    logging.info(f"After removing batch duplicates: {len(unique_items)} unique items")
     
     successful_items = []
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # First, get ALL identifiers from the items we want to add
-        identifiers_to_check = [item['identifier'] for item in item_objects_list]
-        
-        # Remove duplicates within the batch itself
-        unique_identifiers = []
-        seen_in_batch = set()
-        unique_items = []
-        
-        for item in item_objects_list:
-            if item['identifier'] not in seen_in_batch:
-                unique_identifiers.append(item['identifier'])
-                unique_items.append(item)
-                seen_in_batch.add(item['identifier'])
-            else:
-                logging.debug(f"Duplicate within batch: {item['title'][:50]}...")
-        
-        logging.info(f"After removing batch duplicates: {len(unique_items)} unique items")
-        
-        # Batch check which identifiers already exist in database
-        existing_identifiers = set()
-        if unique_identifiers:
-            # Split into chunks to avoid SQL query limits
-            chunk_size = 500  # SQLite variable limit is typically 999
-            for i in range(0, len(unique_identifiers), chunk_size):
-                chunk = unique_identifiers[i:i+chunk_size]
-                placeholders = ','.join('?' * len(chunk))
-                cursor.execute(f'SELECT identifier FROM seen_items WHERE identifier IN ({placeholders})', chunk)
-                existing_identifiers.update(row[0] for row in cursor.fetchall())
-        
-        # Prepare data for items that truly don't exist
-        batch_data = []
-        items_to_add = []
-        
-        for item_object in unique_items:
-            if item_object['identifier'] not in existing_identifiers:
-                batch_data.append((
-                    item_object['timestamp'],
-                    item_object['title'],
-                    item_object['description'],
-                    item_object['link'],
-                    item_object['identifier']
-                ))
-                items_to_add.append(item_object)
+        # One transaction for the whole batch
+        with database(db_path, write=True) as conn:
+            cursor = conn.cursor()
+            if SQLITE_SUPPORTS_RETURNING:
+                # One statement per chunk; RETURNING lists only the rows that were not duplicates
+                inserted_identifiers = set()
+                for i in range(0, len(unique_items), INSERT_CHUNK_ROWS):
+                    chunk = unique_items[i:i+INSERT_CHUNK_ROWS]
+                    sql = INSERT_ITEMS_RETURNING_SQL.format(rows=','.join(['(?, ?, ?, ?, ?, ?)'] * len(chunk)))
+                    params = [value for item_object in chunk for value in item_row(item_object)]
+                    inserted_identifiers.update(row[0] for row in cursor.execute(sql, params))
+                successful_items = [item for item in unique_items if item['identifier'] in inserted_identifiers]
             else:
-                logging.debug(f"Skipping database duplicate: {item_object['title'][:50]}...")
+                # Row by row; rows the primary key ignores report rowcount 0
+                for item_object in unique_items:
+                    if cursor.execute(INSERT_ITEM_SQL, item_row(item_object)).rowcount == 1:
+                        successful_items.append(item_object)
         
-        logging.info(f"After removing database duplicates: {len(items_to_add)} items to insert")
+        logging.debug(f"Skipped {len(unique_items) - len(successful_items)} items already in the database")
         
-        # Batch insert all new items
-        if batch_data:
-            try:
-                cursor.executemany('''
-                    INSERT INTO seen_items (timestamp, title, description, link, identifier)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', batch_data)
-                
-                rows_inserted = cursor.rowcount
-                conn.commit()
-                
-                if rows_inserted > 0:
-                    logging.info(f"✓ Successfully batch inserted {rows_inserted} new items to database")
-                    successful_items = items_to_add
-                else:
-                    logging.warning(f"✗ Batch insert failed - no rows affected")
-                    
-            except sqlite3.IntegrityError as e:
-                # Handle any remaining unique constraint violations gracefully
-                logging.warning(f"Integrity error during batch insert (some duplicates may exist): {e}")
-                # Fall back to individual inserts for the problematic batch
-                conn.rollback()
-                successful_items = []
-                
-                for item_data, item_object in zip(batch_data, items_to_add):
-                    try:
-                        cursor.execute('''
-                            INSERT INTO seen_items (timestamp, title, description, link, identifier)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', item_data)
-                        successful_items.append(item_object)
-                    except sqlite3.IntegrityError:
-                        logging.debug(f"Skipping duplicate item in fallback: {item_object['title'][:50]}...")
-                        continue
-                
-                if successful_items:
-                    conn.commit()
-                    logging.info(f"✓ Fallback individual inserts: {len(successful_items)} items added")
-                    
+        if successful_items:
+            logging.info(f"✓ Successfully batch inserted {len(successful_items)} new items to database")
         else:
             logging.info("No new items to insert - all were duplicates")
         
-        conn.close()
-        
     except sqlite3.Error as e:
         logging.error(f"✗ Database error during batch insert: {e}")
+        return None
         
     return successful_items
 
-def check_identifier_exists(identifier, db_path=DATABASE_FILE):
-    """Check if identifier exists in database (used for cache misses)."""
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM seen_items WHERE identifier = ?', (identifier,))
-        exists = cursor.fetchone()[0] > 0
-        conn.close()
-        return exists
-    except sqlite3.Error as e:
-        logging.error(f"Error checking identifier existence: {e}")
-        return False
-
 def update_memory_cache(new_identifiers):
-    """Update the in-memory cache with new identifiers, maintaining size limit."""
-    global seen_item_identifiers_set
-    
-    # Add new identifiers to cache
+    """
+    Update the in-memory LRU cache with an iterable of identifiers, evicting the least recently
+    seen beyond the size limit.
+    """
+    # Add (or refresh) identifiers at the most recently used end
     for identifier in new_identifiers:
-        seen_item_identifiers_set.add(identifier)
+        seen_item_identifiers[identifier] = None
+        seen_item_identifiers.move_to_end(identifier)
     
-    # If cache is too large, remove oldest identifiers
-    # Note: In practice, you might want to implement LRU cache or use a proper cache library
-    if len(seen_item_identifiers_set) > MEMORY_CACHE_SIZE:
-        # Convert to list, sort, and keep most recent
-        # This is a simple implementation; for better performance, consider using collections.OrderedDict
-        excess_count = len(seen_item_identifiers_set) - MEMORY_CACHE_SIZE
-        identifiers_list = list(seen_item_identifiers_set)
-        # Remove first N items (oldest in insertion order - not perfect but acceptable)
-        for i in range(excess_count):
-            seen_item_identifiers_set.discard(identifiers_list[i])
+    # If cache is too large, remove the least recently used identifiers from the front
+    if len(seen_item_identifiers) > MEMORY_CACHE_SIZE:
+        while len(seen_item_identifiers) > MEMORY_CACHE_SIZE:
+            seen_item_identifiers.popitem(last=False)
         
-        logging.debug(f"Trimmed memory cache, now contains {len(seen_item_identifiers_set)} identifiers")
+        logging.debug(f"Trimmed memory cache, now contains {len(seen_item_identifiers)} identifiers")
 
 # --- End Database Functions ---
 
@@ -356,10 +443,13 @@ def initialize_persistent_browser():
         # Close existing browser if any
         cleanup_persistent_browser()
         
-        # Randomly select a user agent for this session
-        selected_agent = random.choice(USER_AGENTS)
+        # Same pinned user agent as the plain HTTP session
+        selected_agent = session_user_agent
         logging.info(f"Initializing persistent browser with User-Agent: {selected_agent}")
         
+        # Imported here: SeleniumBase is heavy and only needed once the HTTP path has failed
+        from seleniumbase import Driver
+        
         # Create new browser session (not using context manager)
         persistent_browser = Driver(uc=True, headless=True, agent=selected_agent)
         
@@ -378,14 +468,15 @@ def cleanup_persistent_browser():
     """Clean up the persistent browser session."""
     global persistent_browser
     
-    if persistent_browser:
-        try:
-            persistent_browser.quit()
-            logging.info("✓ Persistent browser session closed")
-        except Exception as e:
-            logging.warning(f"Warning during browser cleanup: {e}")
-        finally:
-            persistent_browser = None
+    with browser_lock:
+        if persistent_browser:
+            try:
+                persistent_browser.quit()
+                logging.info("✓ Persistent browser session closed")
+            except Exception as e:
+                logging.warning(f"Warning during browser cleanup: {e}")
+            finally:
+                persistent_browser = None
 
 def should_refresh_browser():
     """Check if browser should be refreshed based on usage count."""
@@ -396,29 +487,47 @@ def get_persistent_browser():
     """Get the persistent browser, initializing or refreshing if needed."""
     global persistent_browser, browser_refresh_counter
     
-    # Initialize browser if it doesn't exist
-    if persistent_browser is None:
-        if not initialize_persistent_browser():
-            return None
-    
-    # Refresh browser if it's been used too many times
-    elif should_refresh_browser():
-        logging.info(f"Browser has been used {browser_refresh_counter} times. Refreshing session...")
-        if not initialize_persistent_browser():
-            return None
-    
-    return persistent_browser
+    with browser_lock:
+        # Initialize browser if it doesn't exist
+        if persistent_browser is None:
+            if not initialize_persistent_browser():
+                return None
+        
+        # Refresh browser if it's been used too many times
+        elif should_refresh_browser():
+            logging.info(f"Browser has been used {browser_refresh_counter} times. Refreshing session...")
+            if not initialize_persistent_browser():
+                return None
+        
+        return persistent_browser
+
+# Quit Chrome when the process exits, even if the server's shutdown hook never ran
+atexit.register(cleanup_persistent_browser)
 
 # --- End Browser Session Management ---
 
-# Initialize database on module load
-init_database()
-logging.info(f"Database file path: {os.path.abspath(DATABASE_FILE)}")
-logging.info(f"Application directory: {SCRIPT_DIR}")
+# Seen items, loaded from the database on first use rather than at import
+seen_item_objects_list = None
+seen_item_identifiers = None
+init_lock = threading.Lock()
 
-# Load seen items on module initialization
-seen_item_objects_list, seen_item_identifiers_set = load_seen_items()
-logging.info(f"Module initialization complete. Loaded {len(seen_item_objects_list)} items, {len(seen_item_identifiers_set)} unique identifiers")
+def _ensure_initialized():
+    """Initialize the database and load seen items once, on the first call that needs them."""
+    global seen_item_objects_list, seen_item_identifiers
+    
+    if seen_item_objects_list is not None:
+        return
+    with init_lock:
+        if seen_item_objects_list is not None:
+            return
+        init_database()
+        logging.info(f"Database file path: {DATABASE_FILE}")
+        logging.info(f"Application directory: {SCRIPT_DIR}")
+        
+        item_objects_list, seen_item_identifiers = load_seen_items()
+        # Published last: other threads treat a non-None list as "initialized"
+        seen_item_objects_list = item_objects_list
+        logging.info(f"Module initialization complete. Loaded {len(seen_item_objects_list)} items, {len(seen_item_identifiers)} unique identifiers")
 
 # Define User Agents - Keep for now, SB UC might handle this or we might re-add if needed
 USER_AGENTS = [
@@ -429,124 +538,407 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
 ]
 
+# One User-Agent for the process, shared by the HTTP session and the browser so the feed host
+# sees a stable client; it only changes when a challenge page suggests it has been flagged.
+# Rotation walks a list shuffled once at startup, so every agent is used before any repeats.
+user_agent_cycle = itertools.cycle(random.sample(USER_AGENTS, len(USER_AGENTS)))
+session_user_agent = next(user_agent_cycle)
+http_session.headers["User-Agent"] = session_user_agent
+
+# Cloudflare challenge markers. They appear near the top of the page, so only the first 64 KiB
+# is scanned, in a single pass for both markers.
+CHALLENGE_RE = re.compile(r'challenge-page|Just a moment\.\.\.')
+CHALLENGE_BYTES_RE = re.compile(CHALLENGE_RE.pattern.encode('ascii'))
+CHALLENGE_SCAN_LIMIT = 64 * 1024
+
+def is_challenge_page(content):
+    """True if the page (str from the browser, bytes from HTTP) looks like a Cloudflare challenge."""
+    pattern = CHALLENGE_BYTES_RE if isinstance(content, bytes) else CHALLENGE_RE
+    # pos/endpos bound the search without copying a slice of the page
+    return pattern.search(content, 0, CHALLENGE_SCAN_LIMIT) is not None
+
+def rotate_user_agent(restart_browser=False):
+    """
+    Switch to a different User-Agent after a challenge page. The HTTP session uses it at once;
+    the browser adopts it on its next start, which is only forced when restart_browser is set
+    (i.e. the browser itself was challenged). Plain-HTTP challenges are routine, so they must
+    not relaunch the persistent browser on every poll.
+    """
+    global session_user_agent, browser_refresh_counter
+    
+    session_user_agent = next(user_agent_cycle)
+    http_session.headers["User-Agent"] = session_user_agent
+    if restart_browser:
+        with browser_lock:
+            # Make get_persistent_browser() restart the session with the new agent on its next use
+            browser_refresh_counter = MAX_BROWSER_REUSES
+    logging.info(f"Challenge detected; rotated User-Agent to: {session_user_agent}")
+
 def get_initial_items():
-    """Returns the list of item objects loaded at startup."""
-    global seen_item_objects_list, seen_item_identifiers_set
+    """Returns the item objects loaded at startup (and found since) as a tuple."""
+    global seen_item_objects_list, seen_item_identifiers
+    
+    _ensure_initialized()
     
     # If in-memory list is empty, reload from database
     if not seen_item_objects_list:
         logging.warning("In-memory item list is empty, reloading from database...")
-        seen_item_objects_list, seen_item_identifiers_set = load_seen_items()
+        seen_item_objects_list, seen_item_identifiers = load_seen_items()
     
     logging.info(f"Returning {len(seen_item_objects_list)} items from get_initial_items()")
-    # Return a copy to prevent external modification of the original list
-    return list(seen_item_objects_list)
+    # A tuple snapshot: read-only for callers, and safe to iterate while polling appends
+    return tuple(seen_item_objects_list)
+
+class FeedState:
+    """Conditional-GET validators and server pacing hints carried between polls of one feed."""
+
+    def __init__(self):
+        self.etag = None
+        self.last_modified = None
+        # Seconds the server asked us to wait (Retry-After / Cache-Control max-age), if any
+        self.delay_hint = None
+
+def get_delay_hint(response):
+    """Extract the polling delay (in seconds) requested by the server, if any."""
+    if response.status_code in (429, 503):
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            if retry_after.isdigit():
+                return float(retry_after)
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                return None
+
+    max_age = re.search(r'max-age=(\d+)', response.headers.get("Cache-Control", ""))
+    if max_age:
+        return float(max_age.group(1))
+    return None
+
+def fetch_content_conditional(url, feed_state):
+    """
+    Fetches the feed with a plain conditional GET using the validators stored in feed_state.
+
+    Returns a (not_modified, xml_content) tuple. xml_content is the raw response body (bytes),
+    left for the parser to decode from the XML declaration; it is None when the plain HTTP
+    request could not be used (blocked, error, challenge page) and the caller should fall
+    back to the browser session. A rate-limited response (HTTP 429/503 without a challenge
+    page) is reported as not_modified: the server asked us to slow down, so there is nothing
+    new this poll and feed_state.delay_hint paces the next one instead of the browser.
+    """
+    # User-Agent comes from the session headers (session_user_agent)
+    headers = {
+        "Accept-Encoding": "gzip, deflate",
+    }
+    if feed_state.etag:
+        headers["If-None-Match"] = feed_state.etag
+    if feed_state.last_modified:
+        headers["If-Modified-Since"] = feed_state.last_modified
+
+    try:
+        response = http_session.get(url, headers=headers, timeout=15)
+    except requests.RequestException as e:
+        logging.warning(f"Conditional GET failed for {url}: {e}")
+        return False, None
+
+    feed_state.delay_hint = get_delay_hint(response)
+
+    if response.status_code == 304:
+        logging.info(f"Feed not modified since last poll (HTTP 304): {url}")
+        return True, None
+
+    # Raw bytes: no text decode here only to have the parser encode it again
+    xml_content = response.content
+    if is_challenge_page(xml_content):
+        logging.warning(f"Conditional GET for {url} was answered with a challenge page. Falling back to browser.")
+        rotate_user_agent()
+        return False, None
+
+    if response.status_code in (429, 503):
+        logging.warning(f"Conditional GET for {url} was rate limited (HTTP {response.status_code}); "
+                        f"backing off for {feed_state.delay_hint or 0:.0f}s.")
+        return True, None
+
+    if response.status_code != 200:
+        logging.warning(f"Conditional GET for {url} returned HTTP {response.status_code}. Falling back to browser.")
+        if response.status_code == 403:
+            # Refused outright: the agent may be flagged even without a challenge page.
+            # Only the HTTP session's agent changes; the browser session is left running.
+            rotate_user_agent()
+        return False, None
+
+    # A real feed has its first <item> near the top
+    if xml_content.find(b"<item", 0, 8192) == -1:
+        logging.warning(f"Conditional GET for {url} did not return a usable feed. Falling back to browser.")
+        return False, None
+
+    feed_state.etag = response.headers.get("ETag")
+    feed_state.last_modified = response.headers.get("Last-Modified")
+    logging.info(f"✓ Fetched feed over plain HTTP for {url}")
+    return False, xml_content
 
 def fetch_content(url):
-    """Fetches XML content using persistent SeleniumBase browser session."""
+    """Fetches XML content using persistent SeleniumBase browser session (fallback when plain HTTP is blocked)."""
     global browser_refresh_counter
     
     xml_content = None
     logging.info(f"Fetching content from: {url} (browser usage: {browser_refresh_counter + 1}/{MAX_BROWSER_REUSES})")
 
-    try:
-        # Get persistent browser instance
-        browser = get_persistent_browser()
-        if not browser:
-            logging.error("Failed to get persistent browser instance")
-            return None
+    # One page load at a time on the shared session
+    with browser_lock:
+        try:
+            # Get persistent browser instance
+            browser = get_persistent_browser()
+            if not browser:
+                logging.error("Failed to get persistent browser instance")
+                return None
         
-        # Navigate to URL using persistent browser
-        logging.info(f"Navigating to: {url}")
-        browser.open(url)
+            # Navigate to URL using persistent browser
+            logging.info(f"Navigating to: {url}")
+            browser.open(url)
         
-        # Increment usage counter
-        browser_refresh_counter += 1
+            # Increment usage counter
+            browser_refresh_counter += 1
         
-        # Get page source
-        xml_content = browser.get_page_source()
+            # Get page source
+            xml_content = browser.get_page_source()
 
-        # Optional: Basic check if it looks like a challenge page
-        if xml_content and ("challenge-page" in browser.get_current_url() or "Just a moment..." in xml_content):
-            logging.warning(f"Page source might contain challenge elements for {url}. Content may be invalid.")
-            # Could implement retry logic here if needed
+            # Optional: Basic check if it looks like a challenge page
+            if xml_content and (is_challenge_page(xml_content) or "challenge-page" in browser.get_current_url()):
+                logging.warning(f"Page source might contain challenge elements for {url}. Content may be invalid.")
+                rotate_user_agent(restart_browser=True)
 
-        if xml_content:
-            logging.info(f"✓ Successfully fetched page source for {url} (session usage: {browser_refresh_counter}/{MAX_BROWSER_REUSES})")
-        else:
-            logging.warning(f"✗ Fetched page source for {url} is empty")
+            if xml_content:
+                logging.info(f"✓ Successfully fetched page source for {url} (session usage: {browser_refresh_counter}/{MAX_BROWSER_REUSES})")
+            else:
+                logging.warning(f"✗ Fetched page source for {url} is empty")
 
-    except Exception as e:
-        logging.error(f"✗ Error during persistent browser operation for {url}: {e}", exc_info=True)
+        except Exception as e:
+            logging.error(f"✗ Error during persistent browser operation for {url}: {e}", exc_info=True)
         
-        # On error, try to reinitialize browser for next attempt
-        logging.info("Attempting to reinitialize browser due to error...")
-        cleanup_persistent_browser()
-        browser_refresh_counter = 0
+            # On error, try to reinitialize browser for next attempt
+            logging.info("Attempting to reinitialize browser due to error...")
+            cleanup_persistent_browser()
+            browser_refresh_counter = 0
 
     return xml_content
 
-def get_new_items(url):
-    """Fetches XML, parses it, and returns a list of new items with optimized processing."""
-    xml_content = fetch_content(url)
+FEED_PARSE_CHUNK = 64 * 1024
+
+def content_identifier(title, description):
+    """
+    Identifier for an item without a link: a 128-bit BLAKE2b of title and description.
+    Fields are hashed incrementally (no concatenated copy) with a separator so ("ab", "c")
+    and ("a", "bc") differ; the 'b2:' prefix keeps these apart from older SHA-256 identifiers.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(title.encode('utf-8'))
+    digest.update(b'\x1f')
+    digest.update(description.encode('utf-8'))
+    return 'b2:' + digest.hexdigest()
+
+# Tracking query parameters that do not change which announcement a link points to
+TRACKING_QUERY_PARAMS = frozenset({'fbclid', 'gclid'})
+
+@lru_cache(maxsize=MEMORY_CACHE_SIZE)
+def canonicalize_link(link):
+    """
+    Identifier for an item link: scheme and host lowercased, utm_*/click-tracking query
+    parameters dropped and any trailing slash removed, so trivially different spellings of
+    the same URL dedupe. Cached, since each poll sees mostly the same links again.
+    """
+    try:
+        parts = urlsplit(link)
+    except ValueError:
+        return link
+    query = parts.query
+    if query:
+        params = parse_qsl(query, keep_blank_values=True)
+        kept = [(key, value) for key, value in params
+                if not key.startswith('utm_') and key not in TRACKING_QUERY_PARAMS]
+        # Re-encode only when something was dropped, so other queries keep their exact spelling
+        if len(kept) != len(params):
+            query = urlencode(kept)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), query, parts.fragment))
+
+def _item_text(fields, name, default):
+    """Stripped text of an <item> child from parse_feed_items' mapping, or default if it was missing."""
+    value = fields.get(name)
+    return value.strip() if value is not None else default
+
+# <item> children; in a recovered tree these can end up nested inside one another
+FEED_ITEM_FIELDS = frozenset({'title', 'description', 'link', 'pubDate', 'pubdate'})
+
+def _field_text(element):
+    """
+    Text of a recovered <item> field including nested markup, but not the text of other item
+    fields nested inside it (their own entries in the mapping carry that).
+    """
+    parts = [element.text or '']
+    for child in element:
+        if not (isinstance(child.tag, str) and child.tag.rpartition('}')[2] in FEED_ITEM_FIELDS):
+            parts.append(''.join(child.itertext()))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+def parse_feed_items(xml_content):
+    """
+    Yields a {child tag: raw text} mapping for each <item> in the feed, in feed order.
+    Text is left unstripped so callers only pay for the fields they actually read.
+    xml_content is either raw bytes (decoded by libxml2 from the XML declaration) or an
+    already-decoded str such as the browser's page source.
+
+    The feed is stream-parsed with lxml and every <item> is dropped once read, so the tree
+    never accumulates and a caller that stops early also stops the parse. Content that is
+    not well-formed XML (e.g. the browser-rendered page) is re-parsed in lxml's recover mode.
+    """
+    found_items = False
+    # Bytes are decoded by libxml2 itself; a str is fed as-is so a non-UTF-8 encoding
+    # declaration is not re-applied to text that is already decoded.
+    # '{*}item' also matches items inside the browser's XHTML-namespaced XML viewer.
+    parser = etree.XMLPullParser(events=('end',), tag='{*}item')
+    try:
+        for start in range(0, len(xml_content), FEED_PARSE_CHUNK):
+            parser.feed(xml_content[start:start + FEED_PARSE_CHUNK])
+            for _, element in parser.read_events():
+                found_items = True
+                # One pass over the item's children instead of a find() per field
+                fields = {}
+                for child in element:
+                    if isinstance(child.tag, str):  # skip comments / processing instructions
+                        fields.setdefault(child.tag.rpartition('}')[2], _field_text(child))
+                yield fields
+                # Free the item and the already-processed siblings still attached to the parent
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        parser.close()
+    except etree.XMLSyntaxError as e:
+        if found_items:
+            logging.warning(f"Feed XML is malformed after the last parsed item: {e}")
+            return
+        logging.info(f"Feed is not well-formed XML ({e}). Re-parsing in recover mode.")
+
+    if found_items:
+        return
+
+    # Not well-formed: a single recovering libxml2 parse. Raw bytes keep libxml2's own encoding
+    # detection; decoded text is encoded as UTF-8 and parsed as such, whatever the declaration says.
+    if isinstance(xml_content, bytes):
+        data, encoding = xml_content, None
+    else:
+        data, encoding = xml_content.encode('utf-8'), 'utf-8'
+    html = False
+    try:
+        root = etree.fromstring(data, etree.XMLParser(recover=True, huge_tree=True, encoding=encoding))
+    except etree.XMLSyntaxError:
+        root = None
+    items = list(root.iter('{*}item')) if root is not None else []
+    if not items:
+        # Fallback: the HTML parser, for content that is closer to a web page than to XML
+        logging.warning("No <item> tags found in recovering XML parse. Trying the HTML parser.")
+        root = etree.fromstring(data, etree.HTMLParser(encoding=encoding))
+        items = list(root.iter('item')) if root is not None else []
+        html = True
+        if not items:
+            logging.warning("No <item> tags found by the HTML parser either.")
+            return
+
+    for item in items:
+        fields = {}
+        # iter() rather than the direct children: a recovering parse can leave an unclosed field
+        # (typically <link>) wrapping the fields that follow it, which are still found this way
+        for element in item.iter():
+            if element is item or not isinstance(element.tag, str):
+                continue
+            name = element.tag.rpartition('}')[2]
+            if name in fields:
+                continue
+            if name == 'link':
+                # Only the URL itself: its text, or its tail where HTML treats <link> as void.
+                # Never itertext(), which would swallow any fields nested inside it.
+                fields[name] = (element.text or '').strip() or (element.tail or '')
+            else:
+                fields[name] = _field_text(element)
+        if html and 'pubdate' in fields:
+            # HTML lowercases tag names
+            fields.setdefault('pubDate', fields.pop('pubdate'))
+        yield fields
+
+def get_new_items(url, feed_state=None):
+    """
+    Fetches XML, parses it, and returns a list of new items with optimized processing.
+
+    The feed is first requested over plain HTTP; the browser session is only used when that
+    is blocked or answered with a challenge page. Passing the same FeedState across polls
+    makes the request conditional, and an unchanged feed (HTTP 304) or a rate-limited
+    request (HTTP 429/503) returns an empty list without touching the parser or the browser.
+    """
+    global inserts_since_trim
+    
+    _ensure_initialized()
+    
+    not_modified, xml_content = fetch_content_conditional(url, feed_state or FeedState())
+    if not_modified:
+        return []
+
+    if not xml_content:
+        xml_content = fetch_content(url)
     if not xml_content:
         logging.warning(f"fetch_content returned no data for {url}. Skipping parsing.")
         return []
+    # No <item> anywhere (empty feed, error page): skip the parser and its recover-mode fallbacks
+    if (b"<item" if isinstance(xml_content, bytes) else "<item") not in xml_content:
+        logging.warning(f"Content fetched from {url} has no <item> tags. Skipping parsing.")
+        return []
 
     new_items_found = []
     potential_new_items = []
     consecutive_known_items = 0
     max_consecutive_known = 10  # Stop after 10 consecutive known items (assuming chronological order)
+    # Items published well before the newest stored one are old; 0 (empty store) disables the cutoff
+    latest_published_at = max((item['published_at'] for item in seen_item_objects_list), default=0)
+    published_cutoff = latest_published_at - PUBLISHED_AT_GRACE_SECONDS if latest_published_at else 0
     
+    processed = 0
+
     try:
-        # Use 'lxml-xml' for potentially stricter XML parsing
-        soup = BeautifulSoup(xml_content, 'lxml-xml') 
+        # Items are diffed as they are parsed; breaking out early also stops the parse
+        for fields in parse_feed_items(xml_content):
+            processed += 1
 
-        items = soup.find_all('item')
-        if not items:
-            # Fallback: Try html.parser if lxml-xml fails and content might be malformed HTML/XML
-            logging.warning("No <item> tags found using 'lxml-xml'. Trying 'html.parser'.")
-            soup = BeautifulSoup(xml_content, 'html.parser')
-            items = soup.find_all('item')
-            if not items:
-                 logging.warning("No <item> tags found using 'html.parser' either.")
-                 return []
-
-        logging.info(f"Found {len(items)} <item> tags in the fetched content.")
-
-        # Process items with early exit strategy
-        for i, item in enumerate(items):
-            title_tag = item.find('title')
-            description_tag = item.find('description')
-            link_tag = item.find('link')
-            pub_date_tag = item.find('pubDate')
-
-            title = title_tag.text.strip() if title_tag else "No Title"
-            description = description_tag.text.strip() if description_tag else "No Description"
             # Link tag might contain the URL directly or within CDATA
-            link_text = link_tag.text.strip() if link_tag else None 
-            pub_date = pub_date_tag.text.strip() if pub_date_tag else ""
-
-            identifier = None
-            if link_text:
-                identifier = link_text
-            else:
-                logging.warning(f"Link tag missing or empty for item '{title[:30]}...'. Using content hash as identifier.")
-                content_to_hash = (title + description).encode('utf-8')
-                identifier = hashlib.sha256(content_to_hash).hexdigest()
+            link_text = _item_text(fields, 'link', None)
+            identifier = canonicalize_link(link_text) if link_text else None
 
-            # Optimized identifier checking with cache + database fallback
-            is_known_item = False
-            
-            # First check in-memory cache (O(1) lookup)
-            if identifier in seen_item_identifiers_set:
+            # Fast path: a link already in the in-memory cache proves the item is known,
+            # so the other fields are never stripped, hashed or looked up
+            if identifier and identifier in seen_item_identifiers:
                 is_known_item = True
+                seen_item_identifiers.move_to_end(identifier)
             else:
-                # Cache miss - check database (this is expensive but necessary for accuracy)
-                if check_identifier_exists(identifier):
-                    is_known_item = True
-                    # Add to cache for future lookups
-                    seen_item_identifiers_set.add(identifier)
+                title = _item_text(fields, 'title', "No Title")
+                description = _item_text(fields, 'description', "No Description")
+                pub_date = _item_text(fields, 'pubDate', "")
+
+                if not identifier:
+                    logging.warning(f"Link tag missing or empty for item '{title[:30]}...'. Using content hash as identifier.")
+                    identifier = content_identifier(title, description)
+
+                # pubDate cutoff: the rest of the feed predates what is already stored. Items with
+                # no parseable pubDate (0) fall back to the consecutive-known heuristic below.
+                published_at = parse_published_at(pub_date)
+                if published_at and published_at < published_cutoff:
+                    logging.info(f"Early exit: item published before the stored items' cutoff. "
+                               f"Processed {processed} items. Assuming remaining items are old.")
+                    break
+
+                # In-memory cache only (O(1) lookup). A miss is treated as a candidate: the batch
+                # INSERT OR IGNORE below is the single database check, so there are no per-item probes
+                is_known_item = identifier in seen_item_identifiers
+                if is_known_item:
+                    seen_item_identifiers.move_to_end(identifier)
 
             if not is_known_item:
                 # This is a new item
@@ -555,22 +947,28 @@ def get_new_items(url):
                     "title": title,
                     "description": description,
                     "link": link_text,
-                    "identifier": identifier
+                    "identifier": identifier,
+                    "published_at": published_at
                 }
                 potential_new_items.append(item_object)
                 consecutive_known_items = 0  # Reset counter
-                logging.debug(f"New item candidate: {title[:50]}... (Published: {pub_date})")
+                logging.debug("New item candidate: %.50s... (Published: %s)", title, pub_date)
             else:
                 consecutive_known_items += 1
-                logging.debug(f"Known item skipped: {title[:50]}... (consecutive: {consecutive_known_items})")
+                logging.debug("Known item skipped: %.50s... (consecutive: %d)", identifier, consecutive_known_items)
                 
                 # Early exit strategy: if we've seen many consecutive known items,
                 # assume we've reached the "old" part of the RSS feed
                 if consecutive_known_items >= max_consecutive_known:
                     logging.info(f"Early exit: Found {consecutive_known_items} consecutive known items. "
-                               f"Processed {i+1}/{len(items)} items. Assuming remaining items are old.")
+                               f"Processed {processed} items. Assuming remaining items are old.")
                     break
 
+        if not processed:
+            return []
+
+        logging.info(f"Parsed {processed} <item> tags from the fetched content.")
+
         # Batch process all new items
         if potential_new_items:
             logging.info(f"Processing {len(potential_new_items)} potential new items in batch...")
@@ -578,20 +976,23 @@ def get_new_items(url):
             # Batch insert to database
             successfully_added = batch_add_new_items(potential_new_items)
             
+            # Unless the batch failed, every candidate is in the database now, whether it was
+            # inserted or ignored as already stored
+            if successfully_added is not None:
+                update_memory_cache(item['identifier'] for item in potential_new_items)
+            
             if successfully_added:
-                # Update in-memory tracking
-                for item_object in successfully_added:
-                    seen_item_objects_list.append(item_object)
-                    new_items_found.append(item_object)
-                
-                # Update memory cache with new identifiers
-                new_identifiers = [item['identifier'] for item in successfully_added]
-                update_memory_cache(new_identifiers)
+                # Update in-memory tracking; the bounded deque drops the oldest items itself
+                seen_item_objects_list.extend(successfully_added)
+                new_items_found = successfully_added
                 
                 logging.info(f"✓ Successfully processed {len(successfully_added)} new items")
                 
-                # Trim database less frequently (only if we added items)
-                save_seen_items(seen_item_objects_list)
+                # Trim database less frequently: only after enough inserts to possibly need it
+                inserts_since_trim += len(successfully_added)
+                if inserts_since_trim >= TRIM_CHECK_INTERVAL:
+                    save_seen_items(seen_item_objects_list)
+                    inserts_since_trim = 0
             else:
                 logging.info("No new items were actually added (all were duplicates)")
         else:
@@ -630,7 +1031,7 @@ if __name__ == "__main__":
         print(f"{'='*60}")
         print(f"Total time for 3 calls: {end_time - start_time:.2f} seconds")
         print(f"Average time per call: {(end_time - start_time)/3:.2f} seconds")
-        print(f"In-memory cache size: {len(seen_item_identifiers_set)}")
+        print(f"In-memory cache size: {len(seen_item_identifiers)}")
         print(f"Total items in database: {len(seen_item_objects_list)}")
         print(f"Browser usage count: {browser_refresh_counter}/{MAX_BROWSER_REUSES}")
         print(f"{'='*60}")